@@ -114,6 +114,15 @@ DATABASES = {
 }
 
 
+# Cache
+# Set CACHE_URL (e.g. redis://127.0.0.1:6379/1) to share cached listing
+# details between processes; defaults to a per-process in-memory cache
+
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://'),
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
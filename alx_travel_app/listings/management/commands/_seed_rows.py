@@ -0,0 +1,112 @@
+"""
+Row builders for the seed command.
+
+These functions only synthesize plain dicts and never touch the ORM, so
+they can run in worker processes without a Django setup or a database
+connection. Keep Django imports out of this module.
+"""
+import random
+from datetime import timedelta
+from decimal import Decimal
+
+
+# Boolean amenity fields on Listing
+AMENITIES = ('has_wifi', 'has_parking', 'has_kitchen', 'has_pool', 'allows_pets')
+
+CITIES = [
+    'Los Angeles, CA', 'Chicago, IL', 'Houston, TX', 'Phoenix, AZ',
+    'Philadelphia, PA', 'San Antonio, TX', 'San Diego, CA', 'Dallas, TX',
+    'San Jose, CA', 'Austin, TX', 'Jacksonville, FL', 'Fort Worth, TX',
+    'Columbus, OH', 'Charlotte, NC', 'San Francisco, CA', 'Indianapolis, IN'
+]
+
+PROPERTY_TYPES = ['apartment', 'house', 'hotel', 'villa', 'cabin']
+
+BOOKING_STATUSES = ['pending', 'confirmed', 'completed']
+
+SPECIAL_REQUESTS = [
+    'Late check-in requested',
+    'Extra towels needed',
+    'Quiet room please',
+    'Ground floor preferred',
+    ''
+]
+
+
+def draw_amenity_flags(rng, count):
+    """Random amenity flags for count listings, one batch draw per amenity"""
+    columns = [rng.choices([True, False], k=count) for _ in AMENITIES]
+    return [dict(zip(AMENITIES, row)) for row in zip(*columns)]
+
+
+def build_listing_rows(start, count, first_number, host_ids, seed):
+    """
+    Build count random listing rows, titled from first_number + start
+    """
+    rng = random.Random(seed)
+    
+    # Draw every random value up front, one batch call per column
+    title_types = rng.choices(PROPERTY_TYPES, k=count)
+    locations = rng.choices(CITIES, k=count)
+    prices = rng.choices(range(50, 501), k=count)
+    types = rng.choices(PROPERTY_TYPES, k=count)
+    max_guests = rng.choices(range(1, 11), k=count)
+    bedrooms = rng.choices(range(1, 6), k=count)
+    bathrooms = rng.choices(range(1, 5), k=count)
+    listing_hosts = rng.choices(host_ids, k=count)
+    amenity_flags = draw_amenity_flags(rng, count)
+    
+    return [
+        {
+            'title': f'Amazing {title_types[i].title()} #{first_number + start + i}',
+            'description': 'A wonderful place to stay with great amenities and comfortable accommodations.',
+            'location': locations[i],
+            'price_per_night': Decimal(prices[i]),
+            'property_type': types[i],
+            'max_guests': max_guests[i],
+            'bedrooms': bedrooms[i],
+            'bathrooms': bathrooms[i],
+            'host_id': listing_hosts[i],
+            **amenity_flags[i],
+        }
+        for i in range(count)
+    ]
+
+
+def build_booking_rows(start, count, listing_info, guest_ids, today, seed):
+    """
+    Build count random booking rows
+    
+    listing_info holds (listing_id, max_guests, price_per_night) tuples.
+    """
+    rng = random.Random(seed)
+    
+    # Draw every random value up front, one batch call per column
+    booking_listings = rng.choices(listing_info, k=count)
+    booking_guests = rng.choices(guest_ids, k=count)
+    start_offsets = rng.choices(range(1, 181), k=count)
+    durations = rng.choices(range(1, 15), k=count)
+    statuses = rng.choices(BOOKING_STATUSES, k=count)
+    special_requests = rng.choices(SPECIAL_REQUESTS, k=count)
+    
+    rows = []
+    for i in range(count):
+        listing_id, max_guests, price_per_night = booking_listings[i]
+        duration = durations[i]
+        
+        # Generate booking dates; duration >= 1 keeps check_out_after_check_in satisfied
+        start_date = today + timedelta(days=start_offsets[i])
+        end_date = start_date + timedelta(days=duration)
+        
+        rows.append({
+            'listing_id': listing_id,
+            'guest_id': booking_guests[i],
+            'check_in_date': start_date,
+            'check_out_date': end_date,
+            'number_of_guests': rng.randint(1, min(max_guests, 4)),
+            'total_price': price_per_night * duration,
+            'status': statuses[i],
+            'special_requests': special_requests[i],
+        })
+    
+    return rows
@@ -1,9 +1,29 @@
+import os
 import random
-from datetime import date, timedelta
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
 from decimal import Decimal
 from django.core.management.base import BaseCommand
+from django.db import connection, transaction
 from django.contrib.auth.models import User
 from listings.models import Listing, Booking, Review
+from ._seed_rows import build_booking_rows, build_listing_rows, draw_amenity_flags
+
+try:
+    # Optional: streams rows through COPY FROM STDIN on PostgreSQL
+    from django_bulk_load import bulk_insert_models
+except ImportError:
+    bulk_insert_models = None
+
+
+# Rows per INSERT statement when bulk creating seed data
+BATCH_SIZE = 500
+
+# Rows between progress lines while inserting
+PROGRESS_INTERVAL = 1000
+
+# Below this many rows, generating in-process beats process pool startup
+PARALLEL_THRESHOLD = 10000
 
 
 class Command(BaseCommand):
@@ -36,8 +56,24 @@ class Command(BaseCommand):
             action='store_true',
             help='Clear existing data before seeding'
         )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Worker processes for generating large row counts (default: CPU count)'
+        )
     
     def handle(self, *args, **options):
+        self.workers = max(options['workers'], 1)
+        self.verbosity = options['verbosity']
+        
+        # One transaction for the whole run: a single commit instead of one
+        # per insert, and a failed run leaves the cleared data in place
+        with transaction.atomic():
+            self.seed(options)
+    
+    def seed(self, options):
+        """Optionally clear travel data, then create the sample data"""
         if options['clear']:
             self.stdout.write(
                 self.style.WARNING('Clearing existing data...')
@@ -61,17 +97,72 @@ class Command(BaseCommand):
         bookings = self.create_sample_bookings(users, listings, options['bookings'])
         
         # Create sample reviews
-        self.create_sample_reviews(users, listings, bookings, options['reviews'])
+        created_reviews = self.create_sample_reviews(users, listings, bookings, options['reviews'])
         
         self.stdout.write(
             self.style.SUCCESS(
                 f'Successfully seeded database with:\n'
                 f'- {len(listings)} listings\n'
                 f'- {len(bookings)} bookings\n'
-                f'- {options["reviews"]} reviews'
+                f'- {created_reviews} reviews'
             )
         )
     
+    def bulk_insert(self, model, objs, ignore_conflicts=False):
+        """
+        Insert unsaved instances in bulk, using COPY on PostgreSQL when
+        django-bulk-load is installed and bulk_create everywhere else.
+        Progress is reported once per PROGRESS_INTERVAL rows; with
+        --verbosity 2 every created row is logged instead.
+        """
+        use_copy = connection.vendor == 'postgresql' and bulk_insert_models is not None
+        created = []
+        
+        for start in range(0, len(objs), PROGRESS_INTERVAL):
+            chunk = objs[start:start + PROGRESS_INTERVAL]
+            if use_copy:
+                # UUID primary keys are already populated in Python, so the
+                # instances stay usable without a RETURNING round-trip
+                bulk_insert_models(chunk, ignore_conflicts=ignore_conflicts)
+            else:
+                chunk = model.objects.bulk_create(
+                    chunk, batch_size=BATCH_SIZE, ignore_conflicts=ignore_conflicts
+                )
+            created.extend(chunk)
+            
+            if self.verbosity >= 2:
+                for obj in chunk:
+                    self.stdout.write(f'Created {model._meta.verbose_name}: {obj}')
+            elif len(objs) > PROGRESS_INTERVAL:
+                self.stdout.write(
+                    f'Created {len(created)}/{len(objs)} {model._meta.verbose_name_plural}'
+                )
+        
+        return created
+    
+    def generate_rows(self, builder, count, *args):
+        """
+        Run a _seed_rows builder for count rows, splitting the work across
+        worker processes when count is large. Workers only return dicts;
+        all database writes stay in this process.
+        """
+        if self.workers == 1 or count < PARALLEL_THRESHOLD:
+            return builder(0, count, *args, random.getrandbits(32))
+        
+        chunk_size = -(-count // self.workers)
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            futures = [
+                executor.submit(
+                    builder, start, min(chunk_size, count - start), *args,
+                    random.getrandbits(32)
+                )
+                for start in range(0, count, chunk_size)
+            ]
+            rows = []
+            for future in futures:
+                rows.extend(future.result())
+        return rows
+    
     def create_sample_users(self):
         """Create sample users if they don't exist"""
         sample_users_data = [
@@ -85,20 +176,28 @@ class Command(BaseCommand):
             {'username': 'emma_guest', 'first_name': 'Emma', 'last_name': 'Garcia', 'email': 'emma@example.com'},
         ]
         
-        users = []
-        for user_data in sample_users_data:
-            user, created = User.objects.get_or_create(
-                username=user_data['username'],
-                defaults={
-                    'first_name': user_data['first_name'],
-                    'last_name': user_data['last_name'],
-                    'email': user_data['email'],
-                    'password': 'pbkdf2_sha256$390000$dummy$hash'  # Dummy password hash
-                }
-            )
-            users.append(user)
-            if created:
-                self.stdout.write(f'Created user: {user.username}')
+        wanted = {data['username']: data for data in sample_users_data}
+        existing = User.objects.in_bulk(wanted.keys(), field_name='username')
+        missing = [
+            User(**wanted[username], password='pbkdf2_sha256$390000$dummy$hash')  # Dummy password hash
+            for username in wanted
+            if username not in existing
+        ]
+        
+        if missing:
+            User.objects.bulk_create(missing)
+            if self.verbosity >= 2:
+                for user in missing:
+                    self.stdout.write(f'Created user: {user.username}')
+            self.stdout.write(f'Created {len(missing)} users')
+            if not connection.features.can_return_rows_from_bulk_insert:
+                # e.g. MySQL: reload so the new users carry their primary keys
+                existing = User.objects.in_bulk(wanted.keys(), field_name='username')
+            else:
+                existing.update({user.username: user for user in missing})
+        
+        # keep the declared order: the first 4 users are hosts, the rest guests
+        users = [existing[username] for username in wanted]
         
         return users
     
@@ -157,96 +256,55 @@ class Command(BaseCommand):
             },
         ]
         
-        # Additional generated listings
-        cities = [
-            'Los Angeles, CA', 'Chicago, IL', 'Houston, TX', 'Phoenix, AZ',
-            'Philadelphia, PA', 'San Antonio, TX', 'San Diego, CA', 'Dallas, TX',
-            'San Jose, CA', 'Austin, TX', 'Jacksonville, FL', 'Fort Worth, TX',
-            'Columbus, OH', 'Charlotte, NC', 'San Francisco, CA', 'Indianapolis, IN'
-        ]
-        
-        property_types = ['apartment', 'house', 'hotel', 'villa', 'cabin']
-        
-        listings = []
+        to_create = []
         hosts = users[:4]  # First 4 users as hosts
+        predefined = sample_listings[:count]
+        amenity_flags = draw_amenity_flags(random, len(predefined))
         
-        # Create predefined listings
-        for i, listing_data in enumerate(sample_listings[:count]):
+        # Stage predefined listings
+        for i, listing_data in enumerate(predefined):
             listing_data['host'] = hosts[i % len(hosts)]
-            listing_data['has_wifi'] = random.choice([True, False])
-            listing_data['has_parking'] = random.choice([True, False])
-            listing_data['has_kitchen'] = random.choice([True, False])
-            listing_data['has_pool'] = random.choice([True, False])
-            listing_data['allows_pets'] = random.choice([True, False])
+            listing_data.update(amenity_flags[i])
             
-            listing = Listing.objects.create(**listing_data)
-            listings.append(listing)
-            self.stdout.write(f'Created listing: {listing.title}')
+            to_create.append(Listing(**listing_data))
         
-        # Create additional random listings if needed
-        for i in range(len(sample_listings), count):
-            listing_data = {
-                'title': f'Amazing {random.choice(property_types).title()} #{i+1}',
-                'description': f'A wonderful place to stay with great amenities and comfortable accommodations.',
-                'location': random.choice(cities),
-                'price_per_night': Decimal(str(random.randint(50, 500))),
-                'property_type': random.choice(property_types),
-                'max_guests': random.randint(1, 10),
-                'bedrooms': random.randint(1, 5),
-                'bathrooms': random.randint(1, 4),
-                'host': random.choice(hosts),
-                'has_wifi': random.choice([True, False]),
-                'has_parking': random.choice([True, False]),
-                'has_kitchen': random.choice([True, False]),
-                'has_pool': random.choice([True, False]),
-                'allows_pets': random.choice([True, False]),
-            }
-            
-            listing = Listing.objects.create(**listing_data)
-            listings.append(listing)
-            self.stdout.write(f'Created listing: {listing.title}')
+        # Stage additional random listings if needed
+        hosts_by_id = {host.id: host for host in hosts}
+        rows = self.generate_rows(
+            build_listing_rows, count - len(predefined),
+            len(sample_listings) + 1, list(hosts_by_id)
+        )
+        for row in rows:
+            host = hosts_by_id[row.pop('host_id')]
+            to_create.append(Listing(host=host, **row))
+        
+        listings = self.bulk_insert(Listing, to_create)
+        self.stdout.write(f'Created {len(listings)} listings')
         
         return listings
     
     def create_sample_bookings(self, users, listings, count):
         """Create sample bookings"""
-        bookings = []
         guests = users[4:]  # Last 4 users as guests
+        listings_by_id = {listing.listing_id: listing for listing in listings}
+        guests_by_id = {guest.id: guest for guest in guests}
+        listing_info = [
+            (listing.listing_id, listing.max_guests, listing.price_per_night)
+            for listing in listings
+        ]
         
-        for i in range(count):
-            listing = random.choice(listings)
-            guest = random.choice(guests)
-            
-            # Generate random booking dates
-            start_date = date.today() + timedelta(days=random.randint(1, 180))
-            duration = random.randint(1, 14)
-            end_date = start_date + timedelta(days=duration)
-            
-            booking_data = {
-                'listing': listing,
-                'guest': guest,
-                'check_in_date': start_date,
-                'check_out_date': end_date,
-                'number_of_guests': random.randint(1, min(listing.max_guests, 4)),
-                'total_price': listing.price_per_night * duration,
-                'status': random.choice(['pending', 'confirmed', 'completed']),
-                'special_requests': random.choice([
-                    'Late check-in requested',
-                    'Extra towels needed',
-                    'Quiet room please',
-                    'Ground floor preferred',
-                    ''
-                ])
-            }
-            
-            try:
-                booking = Booking.objects.create(**booking_data)
-                bookings.append(booking)
-                self.stdout.write(f'Created booking: {booking.booking_id}')
-            except Exception as e:
-                self.stdout.write(
-                    self.style.WARNING(f'Skipped booking creation: {str(e)}')
-                )
+        rows = self.generate_rows(
+            build_booking_rows, count, listing_info, list(guests_by_id), date.today()
+        )
+        
+        to_create = []
+        for row in rows:
+            listing = listings_by_id[row.pop('listing_id')]
+            guest = guests_by_id[row.pop('guest_id')]
+            to_create.append(Booking(listing=listing, guest=guest, **row))
+        
+        bookings = self.bulk_insert(Booking, to_create)
+        self.stdout.write(f'Created {len(bookings)} bookings')
         
         return bookings
     
@@ -266,41 +324,56 @@ class Command(BaseCommand):
             'Good location but could use some updates.',
         ]
         
-        created_reviews = 0
+        to_create = []
+        # (listing_id, reviewer_id) pairs that already have a review
+        existing_pairs = set(Review.objects.values_list('listing_id', 'reviewer_id'))
+        reviews_before = len(existing_pairs)
+        
+        # Completed bookings are consumed in random order, one review each
+        random.shuffle(completed_bookings)
+        
+        # Draw every random value up front, one batch call per column
+        fallback_reviewers = random.choices(users[4:], k=count)  # Guests only
+        fallback_listings = random.choices(listings, k=count)
+        ratings = random.choices(range(3, 6), k=count)  # Mostly positive reviews
+        comments = random.choices(review_comments, k=count)
         
         for i in range(count):
             if completed_bookings:
                 # Create review from a completed booking
-                booking = random.choice(completed_bookings)
+                booking = completed_bookings.pop()
                 reviewer = booking.guest
                 listing = booking.listing
-                completed_bookings.remove(booking)  # Ensure one review per booking
             else:
                 # Create review from any user/listing combination
-                reviewer = random.choice(users[4:])  # Guests only
-                listing = random.choice(listings)
+                reviewer = fallback_reviewers[i]
+                listing = fallback_listings[i]
+                booking = None
             
             # Check if review already exists
-            if Review.objects.filter(listing=listing, reviewer=reviewer).exists():
+            if (listing.listing_id, reviewer.id) in existing_pairs:
                 continue
+            existing_pairs.add((listing.listing_id, reviewer.id))
             
             review_data = {
                 'listing': listing,
                 'reviewer': reviewer,
-                'rating': random.randint(3, 5),  # Mostly positive reviews
-                'comment': random.choice(review_comments),
-                'booking': booking if 'booking' in locals() else None
+                'rating': ratings[i],
+                'comment': comments[i],
+                'booking': booking
             }
             
-            try:
-                review = Review.objects.create(**review_data)
-                created_reviews += 1
-                self.stdout.write(f'Created review: {review.review_id}')
-            except Exception as e:
-                self.stdout.write(
-                    self.style.WARNING(f'Skipped review creation: {str(e)}')
-                )
+            to_create.append(Review(**review_data))
+        
+        # rows are pre-filtered against existing pairs; this only covers
+        # reviews written concurrently since that check
+        self.bulk_insert(Review, to_create, ignore_conflicts=True)
+        
+        # skipped conflicts are still in to_create, so count what was inserted
+        created_reviews = Review.objects.count() - reviews_before
         
         self.stdout.write(
             self.style.SUCCESS(f'Created {created_reviews} reviews')
-        )
\ No newline at end of file
+        )
+        
+        return created_reviews
\ No newline at end of file
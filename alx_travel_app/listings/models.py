@@ -1,8 +1,35 @@
-import uuid
 from django.db import models
 from django.contrib.auth.models import User
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.core.exceptions import ValidationError
+from django.db.models.functions import Concat, Trim
+from .utils import uuid7
+
+
+def full_name(relation):
+    """
+    SQL equivalent of User.get_full_name() for the user behind relation
+    """
+    return Trim(Concat(
+        f'{relation}__first_name', models.Value(' '), f'{relation}__last_name',
+        output_field=models.CharField()
+    ))
+
+
+class ListingQuerySet(models.QuerySet):
+    """
+    QuerySet for listings with database-side annotations
+    """
+    def with_host_name(self):
+        """Annotate the host's full name"""
+        return self.annotate(host_full_name=full_name('host'))
+    
+    def with_review_stats(self):
+        """Annotate average rating and review count in the same query"""
+        return self.annotate(
+            avg_rating=models.Avg('reviews__rating'),
+            review_count=models.Count('reviews'),
+        )
 
 
 class Listing(models.Model):
@@ -20,9 +47,8 @@ class Listing(models.Model):
     
     listing_id = models.UUIDField(
         primary_key=True,
-        default=uuid.uuid4,
-        editable=False,
-        db_index=True
+        default=uuid7,
+        editable=False
     )
     
     title = models.CharField(max_length=200, null=False, blank=False)
@@ -69,6 +95,8 @@ class Listing(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = ListingQuerySet.as_manager()
+    
     class Meta:
         db_table = 'listings_listing'
         ordering = ['-created_at']
@@ -83,17 +111,25 @@ class Listing(models.Model):
     def __str__(self):
         return f"{self.title} - {self.location}"
     
+    @property
+    def host_name(self):
+        """Host's full name, read from the with_host_name() annotation when present"""
+        if hasattr(self, 'host_full_name'):
+            return self.host_full_name
+        return self.host.get_full_name()
+    
     @property
     def average_rating(self):
-        """Calculate average rating from reviews"""
-        reviews = self.reviews.all()
-        if reviews:
-            return sum(review.rating for review in reviews) / len(reviews)
-        return 0
+        """Average rating, read from the with_review_stats() annotation when present"""
+        if hasattr(self, 'avg_rating'):
+            return self.avg_rating or 0
+        return self.reviews.aggregate(avg=models.Avg('rating'))['avg'] or 0
     
     @property
     def total_reviews(self):
-        """Get total number of reviews"""
+        """Total number of reviews, read from the with_review_stats() annotation when present"""
+        if hasattr(self, 'review_count'):
+            return self.review_count
         return self.reviews.count()
 
 
@@ -110,9 +146,8 @@ class Booking(models.Model):
     
     booking_id = models.UUIDField(
         primary_key=True,
-        default=uuid.uuid4,
-        editable=False,
-        db_index=True
+        default=uuid7,
+        editable=False
     )
     
     # relationships
@@ -160,8 +195,11 @@ class Booking(models.Model):
         db_table = 'listings_booking'
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['check_in_date']),
-            models.Index(fields=['check_out_date']),
+            # covers the overlapping-booking check in BookingSerializer.validate
+            models.Index(
+                fields=['listing', 'status', 'check_in_date', 'check_out_date'],
+                name='booking_conflict_idx'
+            ),
             models.Index(fields=['status']),
             models.Index(fields=['created_at']),
         ]
@@ -192,15 +230,23 @@ class Booking(models.Model):
             )
 
 
+class ReviewQuerySet(models.QuerySet):
+    """
+    QuerySet for reviews with database-side annotations
+    """
+    def with_reviewer_name(self):
+        """Annotate the reviewer's full name"""
+        return self.annotate(reviewer_full_name=full_name('reviewer'))
+
+
 class Review(models.Model):
     """
     Model representing a review for a listing
     """
     review_id = models.UUIDField(
         primary_key=True,
-        default=uuid.uuid4,
-        editable=False,
-        db_index=True
+        default=uuid7,
+        editable=False
     )
     
     # relationships
@@ -236,6 +282,8 @@ class Review(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = ReviewQuerySet.as_manager()
+    
     class Meta:
         db_table = 'listings_review'
         ordering = ['-created_at']
@@ -252,4 +300,11 @@ class Review(models.Model):
         ]
     
     def __str__(self):
-        return f"Review by {self.reviewer.username} - {self.rating}/5 stars"
\ No newline at end of file
+        return f"Review by {self.reviewer.username} - {self.rating}/5 stars"
+    
+    @property
+    def reviewer_name(self):
+        """Reviewer's full name, read from the with_reviewer_name() annotation when present"""
+        if hasattr(self, 'reviewer_full_name'):
+            return self.reviewer_full_name
+        return self.reviewer.get_full_name()
\ No newline at end of file
@@ -0,0 +1,12 @@
+from rest_framework import permissions
+
+
+class IsHostOrReadOnly(permissions.BasePermission):
+    """
+    Allow changes to a listing only by its host
+    """
+    
+    def has_object_permission(self, request, view, obj):
+        if request.method in permissions.SAFE_METHODS:
+            return True
+        return obj.host_id == request.user.id
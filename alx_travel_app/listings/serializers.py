@@ -1,8 +1,13 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
+from django.db.models import Exists, OuterRef
 from .models import Listing, Booking, Review
 
 
+# Reviews embedded in a listing detail; the rest are paginated separately
+RECENT_REVIEWS_LIMIT = 5
+
+
 class UserSerializer(serializers.ModelSerializer):
     """
     Serializer for User model
@@ -20,7 +25,7 @@ class ReviewSerializer(serializers.ModelSerializer):
     Serializer for Review model
     """
     reviewer = UserSerializer(read_only=True)
-    reviewer_name = serializers.CharField(source='reviewer.get_full_name', read_only=True)
+    reviewer_name = serializers.CharField(read_only=True)
     
     class Meta:
         model = Review
@@ -47,15 +52,30 @@ class ReviewSerializer(serializers.ModelSerializer):
         return value.strip()
 
 
+class ReviewListSerializer(serializers.ModelSerializer):
+    """
+    Simplified serializer for review lists (reviewer id and name only)
+    """
+    reviewer_name = serializers.CharField(read_only=True)
+    
+    class Meta:
+        model = Review
+        fields = [
+            'review_id', 'reviewer', 'reviewer_name', 'rating',
+            'comment', 'created_at', 'updated_at'
+        ]
+        read_only_fields = fields
+
+
 class ListingSerializer(serializers.ModelSerializer):
     """
-    Serializer for Listing model with nested reviews
+    Serializer for Listing model with its most recent reviews
     """
     host = UserSerializer(read_only=True)
-    host_name = serializers.CharField(source='host.get_full_name', read_only=True)
-    reviews = ReviewSerializer(many=True, read_only=True)
-    average_rating = serializers.ReadOnlyField()
-    total_reviews = serializers.ReadOnlyField()
+    host_name = serializers.CharField(read_only=True)
+    recent_reviews = serializers.SerializerMethodField()
+    average_rating = serializers.FloatField(read_only=True)
+    total_reviews = serializers.IntegerField(read_only=True)
     
     class Meta:
         model = Listing
@@ -63,11 +83,20 @@ class ListingSerializer(serializers.ModelSerializer):
             'listing_id', 'title', 'description', 'location', 'price_per_night',
             'property_type', 'max_guests', 'bedrooms', 'bathrooms', 'host', 
             'host_name', 'has_wifi', 'has_parking', 'has_kitchen', 'has_pool', 
-            'allows_pets', 'is_available', 'reviews', 'average_rating', 
+            'allows_pets', 'is_available', 'recent_reviews', 'average_rating', 
             'total_reviews', 'created_at', 'updated_at'
         ]
         read_only_fields = ['listing_id', 'created_at', 'updated_at']
     
+    def get_recent_reviews(self, obj):
+        """
+        Latest reviews only; the full list is served by the listing reviews endpoint
+        """
+        reviews = getattr(obj, 'prefetched_recent_reviews', None)
+        if reviews is None:
+            reviews = obj.reviews.with_reviewer_name()[:RECENT_REVIEWS_LIMIT]
+        return ReviewListSerializer(reviews, many=True).data
+    
     def validate_price_per_night(self, value):
         """
         Custom validation for price
@@ -98,9 +127,9 @@ class ListingListSerializer(serializers.ModelSerializer):
     """
     Simplified serializer for listing lists (without reviews)
     """
-    host_name = serializers.CharField(source='host.get_full_name', read_only=True)
-    average_rating = serializers.ReadOnlyField()
-    total_reviews = serializers.ReadOnlyField()
+    host_name = serializers.CharField(read_only=True)
+    average_rating = serializers.FloatField(read_only=True)
+    total_reviews = serializers.IntegerField(read_only=True)
     
     class Meta:
         model = Listing
@@ -144,23 +173,9 @@ class BookingSerializer(serializers.ModelSerializer):
         if check_out <= check_in:
             raise serializers.ValidationError("Check-out date must be after check-in date")
         
-        # validate listing exists and is available
-        try:
-            listing = Listing.objects.get(listing_id=listing_id)
-            if not listing.is_available:
-                raise serializers.ValidationError("This listing is not available for booking")
-        except Listing.DoesNotExist:
-            raise serializers.ValidationError("Invalid listing ID")
-        
-        # Validate guest capacity
-        if number_of_guests > listing.max_guests:
-            raise serializers.ValidationError(
-                f"Number of guests ({number_of_guests}) exceeds listing capacity ({listing.max_guests})"
-            )
-        
-        # check for conflicting bookings
+        # bookings on the listing that overlap the requested dates
         conflicting_bookings = Booking.objects.filter(
-            listing=listing,
+            listing=OuterRef('pk'),
             status__in=['confirmed', 'pending'],
             check_in_date__lt=check_out,
             check_out_date__gt=check_in
@@ -170,23 +185,44 @@ class BookingSerializer(serializers.ModelSerializer):
             # exclude current booking when updating
             conflicting_bookings = conflicting_bookings.exclude(booking_id=self.instance.booking_id)
         
-        if conflicting_bookings.exists():
+        # fetch the listing and the conflict flag in a single query
+        listing = Listing.objects.filter(listing_id=listing_id).annotate(
+            has_conflict=Exists(conflicting_bookings)
+        ).first()
+        
+        # validate listing exists and is available
+        if listing is None:
+            raise serializers.ValidationError("Invalid listing ID")
+        
+        if not listing.is_available:
+            raise serializers.ValidationError("This listing is not available for booking")
+        
+        # Validate guest capacity
+        if number_of_guests > listing.max_guests:
+            raise serializers.ValidationError(
+                f"Number of guests ({number_of_guests}) exceeds listing capacity ({listing.max_guests})"
+            )
+        
+        # check for conflicting bookings
+        if listing.has_conflict:
             raise serializers.ValidationError("These dates are not available for booking")
         
+        # hand the resolved listing to create() so it is not fetched twice
+        data['listing'] = listing
+        data.pop('listing_id', None)
+        
         return data
     
     def create(self, validated_data):
         """
         Create booking with current user as guest and calculate total price
         """
-        listing_id = validated_data.pop('listing_id')
-        listing = Listing.objects.get(listing_id=listing_id)
+        listing = validated_data['listing']
         
         # calculate total price
         duration = (validated_data['check_out_date'] - validated_data['check_in_date']).days
         total_price = listing.price_per_night * duration
         
-        validated_data['listing'] = listing
         validated_data['guest'] = self.context['request'].user
         validated_data['total_price'] = total_price
         
@@ -1,3 +1,357 @@
+import json
+from collections import Counter
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient, APIRequestFactory
+from .models import Listing, Booking, Review
+from .management.commands import seed
+from .serializers import RECENT_REVIEWS_LIMIT, BookingSerializer, ListingListSerializer
 
-# Create your tests here.
+
+class ListingAPITestCase(TestCase):
+    """
+    Three listings by one host, each reviewed by the same three guests
+    """
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.host = User.objects.create(username='host', first_name='Host', last_name='User')
+        reviewers = [
+            User.objects.create(username=f'guest{i}', first_name='Guest', last_name=str(i))
+            for i in range(3)
+        ]
+        cls.listings = [
+            Listing.objects.create(
+                title=f'Listing {i}',
+                description='A place to stay.',
+                location='Nairobi',
+                price_per_night=Decimal('100.00'),
+                host=cls.host,
+            )
+            for i in range(3)
+        ]
+        for listing in cls.listings:
+            for reviewer in reviewers:
+                Review.objects.create(
+                    listing=listing,
+                    reviewer=reviewer,
+                    rating=4,
+                    comment='Great place to stay.',
+                )
+    
+    def setUp(self):
+        self.client = APIClient()
+
+
+class ListingQueryCountTests(ListingAPITestCase):
+    """
+    Lock the number of queries issued by the listing endpoints
+    """
+    
+    def test_list_is_a_count_and_a_page_query(self):
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/listings/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual(len(response.data['results']), 3)
+        self.assertEqual(response.data['results'][0]['total_reviews'], 3)
+    
+    def test_detail_loads_recent_reviews_with_annotated_names(self):
+        listing = self.listings[0]
+        cache.clear()
+        # cache version lookup, listing with host, host name and stats, then
+        # recent reviews with the reviewer name annotated (no User rows)
+        with self.assertNumQueries(3):
+            response = self.client.get(f'/api/listings/{listing.listing_id}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['recent_reviews']), 3)
+        self.assertEqual(response.data['average_rating'], 4.0)
+        self.assertEqual(response.data['host_name'], 'Host User')
+        self.assertTrue(response.data['recent_reviews'][0]['reviewer_name'].startswith('Guest '))
+    
+    def test_detail_cache_hit_is_a_single_query(self):
+        listing = self.listings[1]
+        cache.clear()
+        self.client.get(f'/api/listings/{listing.listing_id}/')
+        # only the cache version lookup on a cache hit
+        with self.assertNumQueries(1):
+            response = self.client.get(f'/api/listings/{listing.listing_id}/')
+        self.assertEqual(len(response.data['recent_reviews']), 3)
+
+
+class ListingEndpointTests(ListingAPITestCase):
+    """
+    Responses of the listing and listing review endpoints
+    """
+    
+    def test_list_is_paginated(self):
+        response = self.client.get('/api/listings/?page_size=2')
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertIsNotNone(response.data['next'])
+    
+    def test_list_matches_list_serializer(self):
+        response = self.client.get('/api/listings/')
+        serialized = ListingListSerializer(Listing.objects.all(), many=True).data
+        self.assertEqual(response.json()['results'], json.loads(JSONRenderer().render(serialized)))
+    
+    def test_detail_unknown_listing_is_404(self):
+        response = self.client.get('/api/listings/not-a-uuid/')
+        self.assertEqual(response.status_code, 404)
+    
+    def test_detail_embeds_only_recent_reviews(self):
+        listing = self.listings[0]
+        for i in range(RECENT_REVIEWS_LIMIT):
+            reviewer = User.objects.create(username=f'extra{i}')
+            Review.objects.create(
+                listing=listing,
+                reviewer=reviewer,
+                rating=5,
+                comment='Lovely stay, would return.',
+            )
+        response = self.client.get(f'/api/listings/{listing.listing_id}/')
+        self.assertEqual(len(response.data['recent_reviews']), RECENT_REVIEWS_LIMIT)
+        # the reviews written last are the ones embedded, newest first
+        extra_ids = list(
+            User.objects.filter(username__startswith='extra').order_by('-id').values_list('id', flat=True)
+        )
+        self.assertEqual([review['reviewer'] for review in response.data['recent_reviews']], extra_ids)
+        self.assertEqual(response.data['total_reviews'], 3 + RECENT_REVIEWS_LIMIT)
+    
+    def test_listing_reviews_are_paginated(self):
+        listing = self.listings[0]
+        response = self.client.get(f'/api/listings/{listing.listing_id}/reviews/?page_size=2')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertIsNotNone(response.data['next'])
+    
+    def test_unknown_listing_reviews_is_404(self):
+        response = self.client.get('/api/listings/00000000-0000-0000-0000-000000000000/reviews/')
+        self.assertEqual(response.status_code, 404)
+
+
+class ListingCacheTests(ListingAPITestCase):
+    """
+    Invalidation of cached listing details
+    """
+    
+    def test_new_review_invalidates_cached_detail(self):
+        listing = self.listings[2]
+        self.client.get(f'/api/listings/{listing.listing_id}/')
+        reviewer = User.objects.create(username='late_guest')
+        Review.objects.create(
+            listing=listing,
+            reviewer=reviewer,
+            rating=2,
+            comment='Not what we expected.',
+        )
+        response = self.client.get(f'/api/listings/{listing.listing_id}/')
+        self.assertEqual(response.data['total_reviews'], 4)
+    
+    def test_deleted_review_invalidates_cached_detail(self):
+        listing = self.listings[2]
+        self.client.get(f'/api/listings/{listing.listing_id}/')
+        listing.reviews.order_by('created_at').first().delete()
+        response = self.client.get(f'/api/listings/{listing.listing_id}/')
+        self.assertEqual(response.data['total_reviews'], 2)
+    
+    def test_edited_review_invalidates_cached_detail(self):
+        listing = self.listings[1]
+        self.client.get(f'/api/listings/{listing.listing_id}/')
+        review = listing.reviews.first()
+        review.comment = 'Updated after a second stay.'
+        review.save()
+        response = self.client.get(f'/api/listings/{listing.listing_id}/')
+        comments = [r['comment'] for r in response.data['recent_reviews']]
+        self.assertIn('Updated after a second stay.', comments)
+
+
+class ListingPermissionTests(TestCase):
+    """
+    Only a listing's host may change it
+    """
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.host = User.objects.create(username='host')
+        cls.other = User.objects.create(username='other')
+        cls.listing = Listing.objects.create(
+            title='Listing',
+            description='A place to stay.',
+            location='Nairobi',
+            price_per_night=Decimal('100.00'),
+            host=cls.host,
+        )
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.url = f'/api/listings/{self.listing.listing_id}/'
+    
+    def test_non_host_cannot_update(self):
+        self.client.force_authenticate(self.other)
+        response = self.client.patch(self.url, {'title': 'Changed'}, format='json')
+        self.assertEqual(response.status_code, 403)
+        self.listing.refresh_from_db()
+        self.assertEqual(self.listing.title, 'Listing')
+    
+    def test_non_host_cannot_delete(self):
+        self.client.force_authenticate(self.other)
+        response = self.client.delete(self.url)
+        self.assertEqual(response.status_code, 403)
+        self.assertTrue(Listing.objects.filter(pk=self.listing.pk).exists())
+    
+    def test_host_can_update(self):
+        self.client.force_authenticate(self.host)
+        response = self.client.patch(self.url, {'title': 'Changed'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.listing.refresh_from_db()
+        self.assertEqual(self.listing.title, 'Changed')
+
+
+class BookingSerializerTests(TestCase):
+    """
+    Validation and creation of bookings through BookingSerializer
+    """
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.host = User.objects.create(username='host')
+        cls.guest = User.objects.create(username='guest')
+        cls.listing = Listing.objects.create(
+            title='Listing',
+            description='A place to stay.',
+            location='Nairobi',
+            price_per_night=Decimal('100.00'),
+            max_guests=2,
+            host=cls.host,
+        )
+    
+    def get_serializer(self, **overrides):
+        request = APIRequestFactory().post('/api/bookings/')
+        request.user = self.guest
+        data = {
+            'listing_id': str(self.listing.listing_id),
+            'check_in_date': '2030-01-10',
+            'check_out_date': '2030-01-13',
+            'number_of_guests': 2,
+            'total_price': '0.00',
+            **overrides,
+        }
+        return BookingSerializer(data=data, context={'request': request})
+    
+    def test_listing_is_fetched_once(self):
+        serializer = self.get_serializer()
+        with self.assertNumQueries(1):
+            self.assertTrue(serializer.is_valid(), serializer.errors)
+        booking = serializer.save()
+        self.assertEqual(booking.listing, self.listing)
+        self.assertEqual(booking.total_price, Decimal('300.00'))
+    
+    def test_rejects_overlapping_booking(self):
+        Booking.objects.create(
+            listing=self.listing,
+            guest=self.guest,
+            check_in_date=date(2030, 1, 12),
+            check_out_date=date(2030, 1, 15),
+            number_of_guests=1,
+            total_price=Decimal('300.00'),
+            status='confirmed',
+        )
+        serializer = self.get_serializer()
+        self.assertFalse(serializer.is_valid())
+        self.assertIn("These dates are not available for booking", str(serializer.errors))
+    
+    def test_rejects_unknown_listing(self):
+        serializer = self.get_serializer(listing_id='00000000-0000-0000-0000-000000000000')
+        self.assertFalse(serializer.is_valid())
+        self.assertIn("Invalid listing ID", str(serializer.errors))
+    
+    def test_rejects_too_many_guests(self):
+        serializer = self.get_serializer(number_of_guests=3)
+        self.assertFalse(serializer.is_valid())
+        self.assertIn("exceeds listing capacity", str(serializer.errors))
+
+
+class SeedCommandTests(TestCase):
+    """
+    The seed management command
+    """
+    
+    def run_seed(self, *args):
+        call_command('seed', *args, stdout=StringIO())
+    
+    def assert_seeded(self, listings, bookings):
+        self.assertEqual(Listing.objects.count(), listings)
+        self.assertEqual(Booking.objects.count(), bookings)
+        
+        # one review per (listing, reviewer) and per booking
+        pairs = Counter(Review.objects.values_list('listing_id', 'reviewer_id'))
+        self.assertTrue(pairs)
+        self.assertEqual(max(pairs.values()), 1)
+        booking_ids = [b for b in Review.objects.values_list('booking_id', flat=True) if b]
+        self.assertEqual(len(booking_ids), len(set(booking_ids)))
+        
+        # generated listings are numbered contiguously after the 5 predefined ones
+        numbers = sorted(
+            int(title.rsplit('#', 1)[1])
+            for title in Listing.objects.filter(title__startswith='Amazing ').values_list('title', flat=True)
+        )
+        self.assertEqual(numbers, list(range(6, listings + 1)))
+    
+    def test_seed_in_process(self):
+        self.run_seed('--listings', '30', '--bookings', '60', '--reviews', '40', '--workers', '1')
+        self.assert_seeded(listings=30, bookings=60)
+    
+    def test_seed_with_worker_processes(self):
+        with mock.patch.object(seed, 'PARALLEL_THRESHOLD', 10), mock.patch.object(
+            seed, 'ProcessPoolExecutor', wraps=seed.ProcessPoolExecutor
+        ) as executor:
+            self.run_seed('--listings', '45', '--bookings', '50', '--reviews', '40', '--workers', '2')
+        executor.assert_called_with(max_workers=2)
+        self.assert_seeded(listings=45, bookings=50)
+    
+    def test_rerun_reuses_users_and_skips_existing_review_pairs(self):
+        self.run_seed('--listings', '10', '--bookings', '30', '--reviews', '40')
+        self.run_seed('--listings', '10', '--bookings', '30', '--reviews', '40')
+        self.assertEqual(User.objects.count(), 8)
+        pairs = Counter(Review.objects.values_list('listing_id', 'reviewer_id'))
+        self.assertEqual(max(pairs.values()), 1)
+    
+    def test_users_keep_declared_order_without_bulk_returning(self):
+        # e.g. MySQL, where bulk_create does not set primary keys
+        command = seed.Command(stdout=StringIO())
+        command.verbosity = 1
+        with mock.patch.object(
+            type(connection.features), 'can_return_rows_from_bulk_insert',
+            new_callable=mock.PropertyMock, return_value=False
+        ):
+            users = command.create_sample_users()
+        self.assertEqual(
+            [user.username for user in users[:4]],
+            ['john_host', 'jane_host', 'mike_traveler', 'sarah_explorer']
+        )
+        self.assertTrue(all(user.pk for user in users))
+    
+    def test_failed_run_rolls_back_clear(self):
+        self.run_seed('--listings', '10', '--bookings', '20', '--reviews', '10')
+        counts = (Listing.objects.count(), Booking.objects.count(), Review.objects.count())
+        
+        with mock.patch.object(
+            seed.Command, 'create_sample_reviews', side_effect=RuntimeError('boom')
+        ):
+            with self.assertRaises(RuntimeError):
+                self.run_seed('--clear', '--listings', '5', '--bookings', '5', '--reviews', '5')
+        
+        self.assertEqual(
+            (Listing.objects.count(), Booking.objects.count(), Review.objects.count()),
+            counts
+        )
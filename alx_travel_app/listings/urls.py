@@ -0,0 +1,11 @@
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+from .views import ListingViewSet, ReviewListView
+
+router = DefaultRouter()
+router.register(r'listings', ListingViewSet, basename='listing')
+
+urlpatterns = [
+    path('', include(router.urls)),
+    path('listings/<uuid:listing_id>/reviews/', ReviewListView.as_view(), name='listing-reviews'),
+]
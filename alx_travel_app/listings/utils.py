@@ -0,0 +1,22 @@
+import os
+import time
+import uuid
+
+
+# Random bits of a version 7 UUID, with the version and variant bits cleared
+_UUID7_RANDOM_MASK = ((1 << 80) - 1) & ~(0xF << 76) & ~(0x3 << 62)
+
+# Version 7 and the RFC 4122 variant
+_UUID7_VERSION_VARIANT = (0x7 << 76) | (0x2 << 62)
+
+
+def uuid7():
+    """
+    Generate a time-ordered UUID (RFC 9562 version 7)
+    
+    The leading 48 bits are the Unix time in milliseconds, so new primary
+    keys land at the end of the index instead of at random positions.
+    """
+    value = (time.time_ns() // 1_000_000) << 80
+    value |= int.from_bytes(os.urandom(10), 'big') & _UUID7_RANDOM_MASK | _UUID7_VERSION_VARIANT
+    return uuid.UUID(int=value)
@@ -1,3 +1,171 @@
-from django.shortcuts import render
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db.models import Avg, Count, FloatField, Max, Prefetch, Value
+from django.db.models.functions import Coalesce
+from rest_framework import generics, viewsets, permissions
+from rest_framework.generics import get_object_or_404
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from .models import Listing, Review, full_name
+from .permissions import IsHostOrReadOnly
+from .serializers import (
+    RECENT_REVIEWS_LIMIT, ListingSerializer, ListingListSerializer, ReviewListSerializer
+)
 
-# Create your views here.
+
+# Seconds a serialized listing detail stays cached; also the longest a
+# renamed host or reviewer can go unnoticed in it
+LISTING_CACHE_TIMEOUT = 60 * 60
+
+# Review columns read by ReviewListSerializer
+REVIEW_LIST_COLUMNS = (
+    'review_id', 'rating', 'comment', 'created_at', 'updated_at',
+    'listing_id', 'reviewer_id'
+)
+
+
+class ListingPagination(PageNumberPagination):
+    """
+    Page size for the listing list
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class ListingViewSet(viewsets.ModelViewSet):
+    """
+    API endpoints for listings
+    """
+    permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsHostOrReadOnly]
+    pagination_class = ListingPagination
+    
+    def get_queryset(self):
+        """
+        Listings with host, review stats and recent reviews loaded up front
+        """
+        # aggregate queries ignore Meta.ordering, so order explicitly
+        queryset = (
+            Listing.objects.select_related('host')
+            .with_host_name()
+            .with_review_stats()
+            .order_by('-created_at')
+        )
+        
+        if self.action == 'list':
+            return queryset
+        
+        # the detail serializer nests the latest reviews with each reviewer's name
+        reviews = (
+            Review.objects.with_reviewer_name()
+            .only(*REVIEW_LIST_COLUMNS)
+            .order_by('-created_at')[:RECENT_REVIEWS_LIMIT]
+        )
+        return queryset.prefetch_related(
+            Prefetch('reviews', queryset=reviews, to_attr='prefetched_recent_reviews')
+        )
+    
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return ListingListSerializer
+        return ListingSerializer
+    
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Serve listing details from the cache, keyed on the listing's
+        updated_at plus its latest review update and review count, so that
+        any change to the listing or its reviews rotates the key. User
+        records are not tracked: a renamed host, or a renamed reviewer in
+        recent_reviews, can be served stale for up to LISTING_CACHE_TIMEOUT.
+        """
+        pk = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+        try:
+            version = (
+                Listing.objects.filter(pk=pk)
+                .values('pk', 'updated_at')
+                .annotate(last_review_at=Max('reviews__updated_at'), review_count=Count('reviews'))
+                .values_list('updated_at', 'last_review_at', 'review_count')
+                .first()
+            )
+        except (ValueError, ValidationError):
+            version = None
+        if version is None:
+            # let the regular lookup produce the 404
+            return super().retrieve(request, *args, **kwargs)
+        
+        updated_at, last_review_at, review_count = version
+        last_review_stamp = last_review_at.timestamp() if last_review_at else 0
+        key = f'listing:{pk}:{updated_at.timestamp()}:{last_review_stamp}:{review_count}'
+        # a cache hit skips get_object() and with it check_object_permissions;
+        # that is only safe while no permission class restricts object reads
+        data = cache.get(key)
+        if data is None:
+            data = self.get_serializer(self.get_object()).data
+            cache.set(key, data, LISTING_CACHE_TIMEOUT)
+        return Response(data)
+    
+    def get_list_values(self):
+        """
+        Flat rows with the same keys as ListingListSerializer, built in SQL
+        """
+        annotations = {
+            'host_name': full_name('host'),
+            'average_rating': Coalesce(Avg('reviews__rating'), Value(0.0), output_field=FloatField()),
+            'total_reviews': Count('reviews'),
+        }
+        fields = ListingListSerializer.Meta.fields
+        columns = [field for field in fields if field not in annotations]
+        
+        # values() before annotate() selects and groups by only these columns,
+        # leaving description and the other unused columns out of the query
+        return (
+            Listing.objects.values(*columns)
+            .annotate(**annotations)
+            .values(*fields)
+            .order_by('-created_at')
+        )
+    
+    def list(self, request, *args, **kwargs):
+        """
+        List listings from a values() projection, skipping model instances
+        and the serializer
+        """
+        queryset = self.filter_queryset(self.get_list_values())
+        
+        page = self.paginate_queryset(queryset)
+        rows = list(queryset) if page is None else page
+        
+        for row in rows:
+            # match DecimalField's string representation
+            row['price_per_night'] = str(row['price_per_night'])
+        
+        if page is not None:
+            return self.get_paginated_response(rows)
+        return Response(rows)
+
+
+class ReviewPagination(PageNumberPagination):
+    """
+    Page size for a listing's reviews
+    """
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class ReviewListView(generics.ListAPIView):
+    """
+    Paginated reviews for a single listing
+    """
+    serializer_class = ReviewListSerializer
+    pagination_class = ReviewPagination
+    
+    def get_queryset(self):
+        # 404 for unknown listings, matching the listing detail route
+        listing = get_object_or_404(Listing.objects.only('pk'), pk=self.kwargs['listing_id'])
+        return (
+            Review.objects.filter(listing=listing)
+            .with_reviewer_name()
+            .only(*REVIEW_LIST_COLUMNS)
+            .order_by('-created_at')
+        )